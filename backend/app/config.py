@@ -10,6 +10,27 @@ class Settings(BaseSettings):
     FRONTEND_URL: str
     FROM_EMAIL:str
     RESEND_API_KEY:str
+    # Model routing: short general queries go to the light model
+    GEMINI_LIGHT_MODEL: str = "gemini-2.0-flash-lite"
+    GEMINI_FULL_MODEL: str = "gemini-2.0-flash"
+    AI_SHORT_QUERY_CHARS: int = 280
+    AI_DEADLINE_SECONDS: float = 45.0  # end-to-end budget per AI call
+    AI_HEDGE_PERCENTILE: float = 95.0  # latency percentile after which a hedged request is sent
+    # Message contents of at least this many bytes are stored compressed (0 disables)
+    MESSAGE_COMPRESSION_THRESHOLD: int = 2048
+    MESSAGE_COMPRESSION: str = "zstd"  # "zstd" (falls back to zlib if unavailable) or "zlib"
+    # Mongo connection pool
+    MONGO_MAX_POOL_SIZE: int = 100
+    MONGO_MIN_POOL_SIZE: int = 10  # connections opened at startup
+    MONGO_MAX_IDLE_TIME_MS: int = 300000
+    MONGO_CONNECT_TIMEOUT_MS: int = 5000
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = 5000
+    MONGO_COMPRESSORS: str = "zstd,zlib"  # wire compression, empty to disable
+    # /ready probe
+    READINESS_CACHE_SECONDS: float = 5.0
+    READINESS_TIMEOUT_SECONDS: float = 2.0
+    READINESS_REQUIRE_UPSTREAMS: bool = False  # also fail readiness when Gemini/OCR are down
+    READINESS_UPSTREAM_CACHE_SECONDS: float = 300.0  # Gemini/OCR probe interval when they are not required
     
     
     class Config:
@@ -1,9 +1,99 @@
-from motor.motor_asyncio import AsyncIOMotorClient
+import asyncio
 from app.config import settings
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
-db = client.get_database()
+# The Motor client is created by connect() from the app lifespan handler rather
+# than at import time, so importing the app (workers, tests, scripts) stays cheap
+client = None
+_database = None
+# Set once ensure_indexes() succeeded; /ready retries it until then
+indexes_ready = False
 
-users_collection = db["users"]
-chat_collection = db["chat"]
-messages_collection = db["messages"]
\ No newline at end of file
+_COLLECTION_ALIASES = {
+    "users_collection": "users",
+    "chat_collection": "chat",
+    "messages_collection": "messages",
+}
+
+def connect():
+    """Create the Motor client (idempotent) and return the default database"""
+    global client, _database
+    if client is None:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        options = {
+            "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+            "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+            "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+            "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+            "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        }
+        if settings.MONGO_COMPRESSORS:
+            options["compressors"] = settings.MONGO_COMPRESSORS
+        client = AsyncIOMotorClient(settings.MONGO_URI, **options)
+        _database = client.get_database()
+    return _database
+
+def close():
+    """Close the Motor client; the next access reconnects"""
+    global client, _database
+    if client is not None:
+        client.close()
+    client = None
+    _database = None
+
+def get_database():
+    return _database if _database is not None else connect()
+
+class _DatabaseProxy:
+    """Forwards to the current database so `from app.db import db` can be bound before connect()"""
+
+    def __getattr__(self, name):
+        return getattr(get_database(), name)
+
+    def __getitem__(self, name):
+        return get_database()[name]
+
+db = _DatabaseProxy()
+
+def __getattr__(name):
+    if name in _COLLECTION_ALIASES:
+        return get_database()[_COLLECTION_ALIASES[name]]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+async def warmup():
+    """
+    Open the minimum pool size worth of connections before serving traffic.
+    Concurrent pings each check out a connection, so the pool grows to about
+    MONGO_MIN_POOL_SIZE right away instead of lazily on the first requests.
+    """
+    database = get_database()
+    size = max(settings.MONGO_MIN_POOL_SIZE, 1)
+    await asyncio.gather(*(database.command("ping") for _ in range(size)))
+
+async def ensure_indexes():
+    """Create the indexes the routes rely on (no-op if they already exist)"""
+    global indexes_ready
+    from pymongo import ASCENDING, DESCENDING, TEXT
+
+    # Text indexes are prefixed with user_id so every search is scoped to one
+    # user's entries instead of scanning the whole collection
+    # Compressed messages are indexed through their plain search_text field.
+    # A collection has a single text index, so replace the content-only one.
+    existing = await db.messages.index_information()
+    if "user_content_text" in existing:
+        await db.messages.drop_index("user_content_text")
+    await db.messages.create_index(
+        [("user_id", ASCENDING), ("content", TEXT), ("search_text", TEXT)],
+        name="user_content_search_text",
+    )
+    await db.chats.create_index(
+        [("user_id", ASCENDING), ("title", TEXT)],
+        name="user_title_text",
+    )
+    # Version lookups for conditional GETs and the latest message of a chat
+    await db.chats.create_index([("user_id", ASCENDING), ("updated_at", DESCENDING)])
+    await db.messages.create_index([("chat_id", ASCENDING), ("timestamp", DESCENDING)])
+    # Keyed walks used by the streaming history export
+    await db.chats.create_index([("user_id", ASCENDING), ("_id", ASCENDING)])
+    await db.messages.create_index([("chat_id", ASCENDING), ("_id", ASCENDING)])
+    indexes_ready = True
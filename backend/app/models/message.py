@@ -8,7 +8,7 @@ class MessageModel(BaseModel):
     chat_id: PyObjectId  # NEW: reference to chat
     user_id: PyObjectId
     role: Literal["user", "ai"]
-    content: str
+    content: str  # stored compressed above a size threshold, see app/utils/message_compression.py
     timestamp: datetime = Field(default_factory=datetime.utcnow)
 
     class Config:
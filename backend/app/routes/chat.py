@@ -10,6 +10,7 @@ from app.db import db
 from app.models.chat import ChatModel
 from app.models.common import PyObjectId
 from app.models.message import MessageModel
+from app.utils.message_compression import compress_message_doc
 
 
 router = APIRouter()
@@ -61,10 +62,16 @@ async def chat_with_ai(request: ChatRequest = Body(...)):
             content=ai_response
         )
         # Insert messages into messages collection
+        # Large contents (typically AI answers) are stored compressed
         await db.messages.insert_many([
-            user_msg.dict(by_alias=True),
-            ai_msg.dict(by_alias=True)
+            compress_message_doc(user_msg.dict(by_alias=True)),
+            compress_message_doc(ai_msg.dict(by_alias=True))
         ])
+        # Keep updated_at in step with the latest message, history ETags rely on it
+        await db.chats.update_one(
+            {"_id": chat_id},
+            {"$set": {"updated_at": ai_msg.timestamp}}
+        )
 
         return {
             "response": ai_response,
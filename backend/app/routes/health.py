@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.services.health_service import check_readiness
+
+router = APIRouter()
+
+@router.get("/ready")
+async def ready():
+    """Readiness probe: 200 once Mongo (and optionally the upstreams) answer, 503 otherwise"""
+    result = await check_readiness()
+    return JSONResponse(
+        status_code=200 if result["ready"] else 503,
+        content=result,
+        headers={"Cache-Control": "no-store"},
+    )
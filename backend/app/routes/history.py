@@ -1,7 +1,11 @@
-from fastapi import APIRouter, HTTPException
-from typing import List
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from typing import List, Optional
 from app.db import db
 from bson import ObjectId
+from app.services.export_service import iter_export_lines, start_stream, gzip_chunks, parse_cursor, DEFAULT_BATCH_SIZE
+from app.utils.http_cache import make_etag, cache_headers, is_not_modified
+from app.utils.message_compression import message_content, decode_message_doc
 
 router = APIRouter(prefix="/history")
 
@@ -20,11 +24,29 @@ def clean_mongo_types(obj):
     return obj
 
 @router.get("/{user_id}")
-async def get_user_history(user_id: str):
+async def get_user_history(user_id: str, request: Request, response: Response):
     """Get all chat sessions for a user, with last message and date"""
     try:
+        user_obj_id = ObjectId(user_id)
+        # chat_with_ai bumps updated_at on every message, so the newest updated_at
+        # plus the chat count identify the version of the list (covered by the
+        # user_id/updated_at index)
+        version = await db.chats.aggregate([
+            {"$match": {"user_id": user_obj_id}},
+            {"$group": {"_id": None, "count": {"$sum": 1}, "updated_at": {"$max": "$updated_at"}}},
+        ]).to_list(length=1)
+        count = version[0]["count"] if version else 0
+        last_updated = version[0]["updated_at"] if version else None
+        etag = make_etag("history", user_id, count, last_updated)
+        # ETag only: deleting an older chat leaves max(updated_at) unchanged, so a
+        # Last-Modified/If-Modified-Since check would wrongly answer 304
+        headers = cache_headers(etag)
+        if is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+
         # Fetch all chats for the user (async)
-        chat_docs = await db.chats.find({"user_id": ObjectId(user_id)}).to_list(length=None)
+        chat_docs = await db.chats.find({"user_id": user_obj_id}).to_list(length=None)
         sessions = []
         for chat in chat_docs:
             chat_id = chat["_id"]
@@ -35,7 +57,7 @@ async def get_user_history(user_id: str):
                 "title": chat.get("title", "Untitled Chat"),
                 "created_at": chat.get("created_at"),
                 "updated_at": chat.get("updated_at"),
-                "last_message": last_msg["content"] if last_msg else None,
+                "last_message": message_content(last_msg) if last_msg else None,
                 "last_message_date": last_msg["timestamp"] if last_msg else None,
             }
             sessions.append(session)
@@ -44,17 +66,62 @@ async def get_user_history(user_id: str):
         return {"sessions": sessions}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching chat history: {str(e)}")
-        
+
+# Declared before /{user_id}/{session_id} so "export" is not taken for a session id
+@router.get("/{user_id}/export")
+async def export_user_history(
+    user_id: str,
+    gzip: bool = False,
+    cursor: Optional[str] = None,
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+):
+    """Stream all chats and messages of a user as NDJSON, optionally gzipped"""
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(status_code=400, detail="Invalid user_id format")
+    try:
+        parse_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        lines = await start_stream(iter_export_lines(user_id, cursor=cursor, batch_size=batch_size))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error exporting chat history: {str(e)}")
+    filename = f"mediscan-history-{user_id}.ndjson"
+    if gzip:
+        return StreamingResponse(
+            gzip_chunks(lines),
+            media_type="application/gzip",
+            headers={"Content-Disposition": f'attachment; filename="{filename}.gz"'},
+        )
+    return StreamingResponse(
+        lines,
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
 #            
 @router.get("/{user_id}/{session_id}")
-async def get_session_messages(user_id: str, session_id: str):
+async def get_session_messages(user_id: str, session_id: str, request: Request, response: Response):
     """Get all messages for a specific session"""
     try:
-        query = {"chat_id": ObjectId(session_id)}
+        chat_id = ObjectId(session_id)
+        chat = await db.chats.find_one({"_id": chat_id}, {"updated_at": 1})
+        last_msg = await db.messages.find_one({"chat_id": chat_id}, {"timestamp": 1}, sort=[("timestamp", -1)])
+        chat_updated = chat.get("updated_at") if chat else None
+        last_message_date = last_msg["timestamp"] if last_msg else None
+        last_modified = max(filter(None, [chat_updated, last_message_date]), default=None)
+        etag = make_etag("session", session_id, chat_updated, last_msg["_id"] if last_msg else None, last_message_date)
+        headers = cache_headers(etag, last_modified)
+        if is_not_modified(request, etag, last_modified):
+            return Response(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+        query = {"chat_id": chat_id}
         messages_cursor = db.messages.find(query).sort("timestamp", 1)
         messages = await messages_cursor.to_list(length=None)
-        # Recursively clean all ObjectId and datetime fields
-        messages = [clean_mongo_types(msg) for msg in messages]
+        # Decompress stored content, then recursively clean all ObjectId and datetime fields
+        messages = [clean_mongo_types(decode_message_doc(msg)) for msg in messages]
         for msg in messages:
             msg["id"] = msg.get("_id", msg.get("id"))
             msg["sender"] = msg.get("role", "user")
@@ -0,0 +1,20 @@
+from fastapi import APIRouter, HTTPException, Query
+from bson import ObjectId
+from app.services.search_service import search_user_history, MAX_PAGE, MAX_PAGE_SIZE
+
+router = APIRouter(prefix="/search")
+
+@router.get("/{user_id}")
+async def search_history(
+    user_id: str,
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1, le=MAX_PAGE),
+    page_size: int = Query(20, ge=1, le=MAX_PAGE_SIZE),
+):
+    """Search a user's messages and chat titles, best matches first"""
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(status_code=400, detail="Invalid user_id format")
+    try:
+        return await search_user_history(user_id, q, page=page, page_size=page_size)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error searching chat history: {str(e)}")
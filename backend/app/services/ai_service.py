@@ -1,19 +1,53 @@
 import os
-import google.generativeai as genai
-import requests
+import time
 import anyio
+import httpx
 from app.config import settings
-from app.services.image_service import extract_text_from_image
+from app.services.model_router import ModelRouter, GeminiModel
 
 OCR_SPACE_API_KEY = settings.OCR_SPACE_API_KEY
 GEMINI_API_KEY = settings.GEMINI_API_KEY
+OCR_SPACE_URL = "https://api.ocr.space/parse/image"
 
-# Configure the Gemini API if API key is available
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel("gemini-2.0-flash")
-else:
-    model = None
+# The model router (and with it the Gemini SDK) and the HTTP client are created
+# on first use and released by close_clients() from the app lifespan handler
+_router = None
+_http_client = None
+
+def get_router():
+    """Return the model router, or None if the GEMINI_API_KEY is not set"""
+    global _router
+    if _router is None and GEMINI_API_KEY:
+        _router = ModelRouter(
+            light=GeminiModel(settings.GEMINI_LIGHT_MODEL),
+            full=GeminiModel(settings.GEMINI_FULL_MODEL),
+            deadline=settings.AI_DEADLINE_SECONDS,
+            hedge_percentile=settings.AI_HEDGE_PERCENTILE,
+            short_query_chars=settings.AI_SHORT_QUERY_CHARS,
+        )
+    return _router
+
+def set_router(router):
+    """Swap in another router, e.g. one built on FakeModel backends for offline runs"""
+    global _router
+    _router = router
+
+def get_http_client():
+    """Return the shared async HTTP client used for upstream APIs"""
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(timeout=30.0)
+    return _http_client
+
+async def init_clients():
+    get_http_client()
+
+async def close_clients():
+    global _router, _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+    _http_client = None
+    _router = None
 
 # System prompt for context
 SYSTEM_PROMPT = """
@@ -55,12 +89,14 @@ Format your response in clear sections with appropriate markdown formatting. If
 
 async def generate_ai_response(message: str) -> str:
     try:
-        if not GEMINI_API_KEY or not model:
+        router = get_router()
+        if not router:
             return "This is a mock response because the GEMINI_API_KEY is not set."
         # Combine system prompt with user message
         full_prompt = f"{SYSTEM_PROMPT}\n\nUser: {message}"
-        response = await anyio.to_thread.run_sync(model.generate_content, full_prompt)
-        return response.text
+        return await router.generate(full_prompt, task="general", query=message)
+    except TimeoutError:
+        return "I'm sorry, the AI service took too long to respond. Please try again."
     except Exception as e:
         error_message = str(e)
         if "API key not valid" in error_message.lower():
@@ -72,21 +108,28 @@ async def analyze_image(image_path: str) -> str:
     Analyze a prescription image by:
     1. Extracting text using OCR.space API
     2. Sending the extracted text to Gemini for analysis
+    Both steps share one end-to-end deadline (AI_DEADLINE_SECONDS).
     """
+    started = time.monotonic()
     try:
-        if not GEMINI_API_KEY or not model:
+        router = get_router()
+        if not router:
             return "Image analysis is not available because the GEMINI_API_KEY is not set."
         if not OCR_SPACE_API_KEY:
             return "Image analysis is not available because the OCR_SPACE_API_KEY is not set."
         if not os.path.exists(image_path):
             return "Error: Image file not found."
         # Extract text using OCR.space API
-        url = "https://api.ocr.space/parse/image"
         headers = {"apikey": OCR_SPACE_API_KEY}
         params = {"language": "eng", "isOverlayRequired": "false", "detectOrientation": "true"}
         with open(image_path, "rb") as file:
-            files = {"file": file}
-            response = requests.post(url, headers=headers, params=params, files=files)
+            files = {"file": (os.path.basename(image_path), file.read())}
+        # httpx timeouts apply per phase, fail_after bounds the whole request
+        with anyio.fail_after(settings.AI_DEADLINE_SECONDS):
+            response = await get_http_client().post(
+                OCR_SPACE_URL, headers=headers, params=params, files=files,
+                timeout=settings.AI_DEADLINE_SECONDS,
+            )
         if response.status_code != 200:
             return "Error: The OCR service returned an error. Please try again later."
         ocr_result = response.json()
@@ -105,8 +148,12 @@ async def analyze_image(image_path: str) -> str:
             return "No text could be extracted from the image. The image might be unclear, rotated, or doesn't contain readable text."
         analysis_prompt = PRESCRIPTION_ANALYSIS_PROMPT.format(extracted_text=extracted_text)
         full_prompt = f"{SYSTEM_PROMPT}\n\n{analysis_prompt}"
-        response = model.generate_content(full_prompt)
-        return response.text
+        # The model gets whatever the OCR step left of the deadline
+        remaining = settings.AI_DEADLINE_SECONDS - (time.monotonic() - started)
+        return await router.generate(full_prompt, task="prescription", query=extracted_text,
+                                     deadline=max(remaining, 0))
+    except (TimeoutError, httpx.TimeoutException):
+        return "I'm sorry, the prescription analysis took too long. Please try again."
     except Exception as e:
         error_message = str(e)
         if "API key not valid" in error_message.lower():
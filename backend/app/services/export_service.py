@@ -0,0 +1,128 @@
+import json
+import zlib
+from typing import AsyncIterator, Optional, Tuple
+from bson import ObjectId
+from app.db import db
+from app.utils.message_compression import message_content
+
+DEFAULT_BATCH_SIZE = 500
+# Sorts before every real ObjectId: "<chat_id>:<_CHAT_START>" resumes at the chat's first message
+_CHAT_START = ObjectId("0" * 24)
+
+def parse_cursor(cursor: Optional[str]) -> Tuple[Optional[ObjectId], Optional[ObjectId]]:
+    """
+    Parse an export resume cursor.
+    "<chat_id>" resumes after that whole chat, "<chat_id>:<message_id>" resumes
+    inside the chat right after that message. Raises ValueError if malformed.
+    """
+    if not cursor:
+        return None, None
+    chat_part, _, message_part = cursor.partition(":")
+    if not ObjectId.is_valid(chat_part) or (message_part and not ObjectId.is_valid(message_part)):
+        raise ValueError("Invalid export cursor")
+    return ObjectId(chat_part), ObjectId(message_part) if message_part else None
+
+def _json_default(obj):
+    if isinstance(obj, ObjectId):
+        return str(obj)
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def _line(record: dict) -> str:
+    return json.dumps(record, default=_json_default, separators=(",", ":")) + "\n"
+
+async def iter_export_lines(user_id: str, cursor: Optional[str] = None,
+                            batch_size: int = DEFAULT_BATCH_SIZE) -> AsyncIterator[str]:
+    """
+    Yield a user's chats and their messages as NDJSON, one chunk per chat
+    (chats with more than batch_size messages are split into several chunks).
+    Chats are walked in _id order and each chat line is followed by its
+    messages. Every line carries the cursor to pass back to resume after it.
+    Documents are read from Motor cursors in batches and never collected, so
+    memory use does not depend on the size of the history.
+    """
+    user_obj_id = ObjectId(user_id)
+    after_chat, after_message = parse_cursor(cursor)
+
+    buffer = []
+
+    if after_message is not None:
+        # Finish the chat the previous export stopped in before moving on
+        chat = await db.chats.find_one({"_id": after_chat, "user_id": user_obj_id})
+        if chat is not None:
+            async for line in _iter_message_lines(chat["_id"], after_message, batch_size):
+                buffer.append(line)
+                if len(buffer) >= batch_size:
+                    yield "".join(buffer)
+                    buffer = []
+            if buffer:
+                yield "".join(buffer)
+                buffer = []
+
+    chat_query = {"user_id": user_obj_id}
+    if after_chat is not None:
+        chat_query["_id"] = {"$gt": after_chat}
+    chats = db.chats.find(chat_query).sort("_id", 1).batch_size(batch_size)
+    async for chat in chats:
+        buffer.append(_line({
+            "type": "chat",
+            "id": chat["_id"],
+            "title": chat.get("title", "Untitled Chat"),
+            "created_at": chat.get("created_at"),
+            "updated_at": chat.get("updated_at"),
+            "cursor": f"{chat['_id']}:{_CHAT_START}",
+        }))
+        async for line in _iter_message_lines(chat["_id"], None, batch_size):
+            buffer.append(line)
+            if len(buffer) >= batch_size:
+                yield "".join(buffer)
+                buffer = []
+        # Flush after every chat so the buffer never holds more than one chat
+        if buffer:
+            yield "".join(buffer)
+            buffer = []
+
+async def _iter_message_lines(chat_id: ObjectId, after_message: Optional[ObjectId],
+                              batch_size: int) -> AsyncIterator[str]:
+    query = {"chat_id": chat_id}
+    if after_message is not None:
+        query["_id"] = {"$gt": after_message}
+    messages = db.messages.find(query).sort("_id", 1).batch_size(batch_size)
+    async for msg in messages:
+        yield _line({
+            "type": "message",
+            "id": msg["_id"],
+            "chat_id": chat_id,
+            "role": msg.get("role"),
+            "content": message_content(msg),
+            "timestamp": msg.get("timestamp"),
+            "cursor": f"{chat_id}:{msg['_id']}",
+        })
+
+async def start_stream(chunks: AsyncIterator[str]) -> AsyncIterator[str]:
+    """
+    Pull the first chunk before the response starts, so a failing query turns
+    into an error status instead of a 200 that is cut off mid-stream.
+    """
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = None
+
+    async def stream():
+        if first is not None:
+            yield first
+        async for chunk in chunks:
+            yield chunk
+
+    return stream()
+
+async def gzip_chunks(chunks: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Gzip a stream of text chunks incrementally"""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
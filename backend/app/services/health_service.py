@@ -0,0 +1,110 @@
+import asyncio
+import logging
+import time
+import anyio
+from app.config import settings
+from app import db
+from app.services.ai_service import get_http_client, OCR_SPACE_URL
+
+logger = logging.getLogger(__name__)
+
+GEMINI_MODELS_URL = "https://generativelanguage.googleapis.com/v1beta/models"
+
+# Probes run at most once per READINESS_CACHE_SECONDS, however often the load
+# balancer polls, so /ready never adds load on Mongo or the upstreams.
+# Unless READINESS_REQUIRE_UPSTREAMS is set, Gemini and OCR are informational:
+# they are probed in the background once per READINESS_UPSTREAM_CACHE_SECONDS
+# and /ready reports their last result without waiting for them
+_cached_result = None
+_checked_at = 0.0
+_lock = asyncio.Lock()
+_upstream_checks = None
+_upstream_checked_at = 0.0
+_upstream_task = None
+
+async def _check_mongo() -> dict:
+    await db.get_database().command("ping")
+    if not db.indexes_ready:
+        # Startup could not reach Mongo; build the indexes now that it answers,
+        # search needs the text indexes so stay unready until this succeeds
+        await db.ensure_indexes()
+    return {"status": "ok"}
+
+async def _check_gemini() -> dict:
+    if not settings.GEMINI_API_KEY:
+        return {"status": "skipped", "detail": "GEMINI_API_KEY is not set"}
+    response = await get_http_client().get(
+        GEMINI_MODELS_URL,
+        params={"pageSize": 1},
+        headers={"x-goog-api-key": settings.GEMINI_API_KEY},
+    )
+    if response.status_code != 200:
+        return {"status": "error", "detail": f"HTTP {response.status_code}"}
+    return {"status": "ok"}
+
+async def _check_ocr() -> dict:
+    if not settings.OCR_SPACE_API_KEY:
+        return {"status": "skipped", "detail": "OCR_SPACE_API_KEY is not set"}
+    # Any non-5xx answer means the service is up, the probe sends no image
+    response = await get_http_client().get(OCR_SPACE_URL)
+    if response.status_code >= 500:
+        return {"status": "error", "detail": f"HTTP {response.status_code}"}
+    return {"status": "ok"}
+
+async def _run_check(name: str, check) -> dict:
+    started = time.monotonic()
+    try:
+        with anyio.fail_after(settings.READINESS_TIMEOUT_SECONDS):
+            result = await check()
+    except TimeoutError:
+        result = {"status": "error", "detail": "timed out"}
+    except Exception as e:
+        # The probe is unauthenticated, keep exception details (hosts, topology) in the logs
+        logger.warning(f"Readiness check {name} failed: {e}")
+        result = {"status": "error", "detail": "unavailable"}
+    result["latency_ms"] = round((time.monotonic() - started) * 1000, 1)
+    return result
+
+async def _check_upstreams() -> dict:
+    names = ["gemini", "ocr"]
+    results = await asyncio.gather(
+        _run_check("gemini", _check_gemini),
+        _run_check("ocr", _check_ocr),
+    )
+    return dict(zip(names, results))
+
+async def _refresh_upstreams():
+    global _upstream_checks, _upstream_checked_at
+    _upstream_checks = await _check_upstreams()
+    _upstream_checked_at = time.monotonic()
+
+def _background_upstreams() -> dict:
+    """Return the last upstream results, starting a refresh once they are stale"""
+    global _upstream_task
+    stale = time.monotonic() - _upstream_checked_at >= settings.READINESS_UPSTREAM_CACHE_SECONDS
+    if (_upstream_checks is None or stale) and (_upstream_task is None or _upstream_task.done()):
+        _upstream_task = asyncio.create_task(_refresh_upstreams())
+    if _upstream_checks is None:
+        return {"gemini": {"status": "pending"}, "ocr": {"status": "pending"}}
+    return _upstream_checks
+
+async def check_readiness() -> dict:
+    """Return the (cached) readiness of this worker and of each dependency"""
+    global _cached_result, _checked_at
+    async with _lock:
+        if _cached_result is not None and time.monotonic() - _checked_at < settings.READINESS_CACHE_SECONDS:
+            return _cached_result
+
+        required = ["mongo"]
+        if settings.READINESS_REQUIRE_UPSTREAMS:
+            required += ["gemini", "ocr"]
+            mongo, upstreams = await asyncio.gather(_run_check("mongo", _check_mongo), _check_upstreams())
+        else:
+            mongo = await _run_check("mongo", _check_mongo)
+            upstreams = _background_upstreams()
+        checks = {"mongo": mongo, **upstreams}
+        ready = all(checks[name]["status"] != "error" for name in required)
+
+        _cached_result = {"ready": ready, "checks": checks}
+        _checked_at = time.monotonic()
+        return _cached_result
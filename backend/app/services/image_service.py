@@ -1,14 +1,20 @@
-import pytesseract
-from PIL import Image
 import io
 import os
 import logging
 
 logger = logging.getLogger(__name__)
 
+def _load_ocr():
+    """Import pytesseract and Pillow on first use, they are slow to import"""
+    import pytesseract
+    from PIL import Image
+
+    return pytesseract, Image
+
 def extract_text_from_image(image_data: bytes) -> str:
     """Extract text from image data using pytesseract OCR"""
     try:
+        pytesseract, Image = _load_ocr()
         logger.info(f"Extracting text from image bytes of size: {len(image_data)} bytes")
         image = Image.open(io.BytesIO(image_data))
         logger.info(f"Image opened successfully. Size: {image.size}, Format: {image.format}")
@@ -25,6 +31,7 @@ def extract_text_from_image(image_data: bytes) -> str:
 def extract_text_from_file(file_path: str) -> str:
     """Extract text from image file using pytesseract OCR"""
     try:
+        pytesseract, Image = _load_ocr()
         if not os.path.exists(file_path):
             logger.error(f"Image file not found: {file_path}")
             raise FileNotFoundError(f"Image file not found: {file_path}")
@@ -0,0 +1,192 @@
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Callable, Dict, Iterable, Optional, Protocol, Union
+import anyio
+from app.config import settings
+
+_genai = None
+
+def _load_genai():
+    """Import and configure the Gemini SDK once, it is slow to import"""
+    global _genai
+    if _genai is None:
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        _genai = genai
+    return _genai
+
+class ModelBackend(Protocol):
+    """Anything that can turn a prompt into text: Gemini in production, FakeModel offline"""
+
+    name: str
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        """timeout is what is left of the router's deadline, the backend must not outlive it"""
+        ...
+
+class GeminiModel:
+    """A Gemini model, created on first use and called through the SDK's async client"""
+
+    def __init__(self, model_name: str):
+        self.name = model_name
+        self._model = None
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        if self._model is None:
+            self._model = _load_genai().GenerativeModel(self.name)
+        # The async client is cancelled with the task (a worker thread would not be),
+        # the SDK timeout also bounds the HTTP call itself
+        request_options = {"timeout": timeout} if timeout is not None else None
+        response = await self._model.generate_content_async(prompt, request_options=request_options)
+        return response.text
+
+class FakeModel:
+    """
+    Offline stand-in for a model backend.
+    latency may be a number or an iterable of per-call latencies (the last value
+    repeats), response may be a string or a callable taking the prompt, and
+    error, if set, is raised after the latency has elapsed. Like the SDK, a call
+    that would outlast its timeout raises TimeoutError once the timeout is up.
+    """
+
+    def __init__(self, name: str, response: Union[str, Callable[[str], str]] = "fake response",
+                 latency: Union[float, Iterable[float]] = 0.0, error: Optional[Exception] = None):
+        self.name = name
+        self.response = response
+        self.error = error
+        self.calls = 0
+        self.prompts = []
+        self.timeouts = []
+        if isinstance(latency, (int, float)):
+            self._latencies = itertools.repeat(float(latency))
+        else:
+            latencies = list(latency)
+            self._latencies = itertools.chain(latencies, itertools.repeat(latencies[-1]))
+
+    async def generate(self, prompt: str, timeout: Optional[float] = None) -> str:
+        self.calls += 1
+        self.prompts.append(prompt)
+        self.timeouts.append(timeout)
+        latency = next(self._latencies)
+        if timeout is not None and latency > timeout:
+            await asyncio.sleep(timeout)
+            raise TimeoutError(f"{self.name} timed out after {timeout}s")
+        await asyncio.sleep(latency)
+        if self.error is not None:
+            raise self.error
+        return self.response(prompt) if callable(self.response) else self.response
+
+class LatencyTracker:
+    """
+    Rolling window of call latencies for one model. Calls cut short (cancelled
+    or timed out) are recorded with the time they ran, so a stalling model
+    raises its percentile instead of only its fast answers being seen.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.samples = deque(maxlen=window)
+        self.min_samples = min_samples
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def percentile(self, pct: float) -> Optional[float]:
+        """Nearest-rank percentile, or None until enough samples were seen"""
+        if len(self.samples) < self.min_samples:
+            return None
+        ordered = sorted(self.samples)
+        rank = max(int(round(pct / 100 * len(ordered))) - 1, 0)
+        return ordered[min(rank, len(ordered) - 1)]
+
+class ModelRouter:
+    """
+    Routes a prompt to the light or full model and runs it under a deadline.
+    When the chosen model has not answered by its recent latency percentile, a
+    duplicate (hedged) request is sent and the first successful answer wins.
+    Raises TimeoutError when the deadline passes.
+    """
+
+    def __init__(self, light: ModelBackend, full: ModelBackend, deadline: float = 45.0,
+                 hedge_percentile: float = 95.0, min_hedge_delay: float = 0.5,
+                 short_query_chars: int = 280, window: int = 200, min_samples: int = 20):
+        self.light = light
+        self.full = full
+        self.deadline = deadline
+        self.hedge_percentile = hedge_percentile
+        self.min_hedge_delay = min_hedge_delay
+        self.short_query_chars = short_query_chars
+        self.latencies: Dict[str, LatencyTracker] = {
+            backend.name: LatencyTracker(window, min_samples) for backend in (light, full)
+        }
+        self.hedges_sent = 0
+
+    def choose(self, task: str, query: str) -> ModelBackend:
+        """Prescription analysis always gets the full model, short general queries the light one"""
+        if task == "general" and len(query.strip()) <= self.short_query_chars:
+            return self.light
+        return self.full
+
+    def hedge_delay(self, backend: ModelBackend) -> Optional[float]:
+        delay = self.latencies[backend.name].percentile(self.hedge_percentile)
+        if delay is None:
+            return None
+        return max(delay, self.min_hedge_delay)
+
+    async def generate(self, prompt: str, task: str = "general", query: Optional[str] = None,
+                       deadline: Optional[float] = None) -> str:
+        backend = self.choose(task, query if query is not None else prompt)
+        deadline = deadline if deadline is not None else self.deadline
+        deadline_at = time.monotonic() + deadline
+        with anyio.fail_after(deadline):
+            return await self._hedged(backend, prompt, deadline_at)
+
+    async def _timed(self, backend: ModelBackend, prompt: str, deadline_at: float,
+                     record_cutoff: bool = False) -> str:
+        """
+        Run one attempt with the rest of the deadline as its timeout. Successes
+        are always recorded; with record_cutoff, so are attempts that were
+        cancelled or timed out (the primary, which started with the request).
+        """
+        started = time.monotonic()
+        tracker = self.latencies[backend.name]
+        try:
+            result = await backend.generate(prompt, timeout=max(deadline_at - started, 0.0))
+        except (asyncio.CancelledError, TimeoutError):
+            if record_cutoff:
+                tracker.record(time.monotonic() - started)
+            raise
+        tracker.record(time.monotonic() - started)
+        return result
+
+    async def _hedged(self, backend: ModelBackend, prompt: str, deadline_at: float) -> str:
+        primary = asyncio.ensure_future(self._timed(backend, prompt, deadline_at, record_cutoff=True))
+        tasks = [primary]
+        try:
+            delay = self.hedge_delay(backend)
+            if delay is not None:
+                done, _ = await asyncio.wait({primary}, timeout=delay)
+                if not done:
+                    self.hedges_sent += 1
+                    tasks.append(asyncio.ensure_future(self._timed(backend, prompt, deadline_at)))
+
+            # First success wins, a failure only counts once every attempt failed
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    # An attempt can time out together with the deadline, its
+                    # error is superseded by the deadline's TimeoutError
+                    task.exception()
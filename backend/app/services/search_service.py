@@ -0,0 +1,127 @@
+import re
+from bson import ObjectId
+from app.db import db
+from app.utils.message_compression import message_content
+
+SNIPPET_RADIUS = 80
+MAX_PAGE_SIZE = 50
+# Deep pages would make Mongo score and return skip + page_size hits from both
+# collections, so only the best MAX_PAGE * page_size matches are reachable
+MAX_PAGE = 20
+# search_text on compressed messages holds distinct words only, so phrase
+# queries find messages by their terms and check the phrase on the decoded
+# content; this many candidates per requested hit are fetched for that
+PHRASE_CANDIDATE_FACTOR = 4
+MAX_PHRASE_CANDIDATES = 2000
+
+_TERM_RE = re.compile(r"[\w'-]+", re.UNICODE)
+_PHRASE_RE = re.compile(r'"([^"]*)"')
+
+def query_terms(query: str) -> list:
+    """Split a search query into the plain terms used for highlighting snippets"""
+    terms = []
+    for token in _TERM_RE.findall(query.lower()):
+        token = token.strip("'-")
+        if token and token not in terms:
+            terms.append(token)
+    return terms
+
+def query_phrases(query: str) -> list:
+    """Return the quoted phrases of a search query, lowercased with normalized spaces"""
+    phrases = [" ".join(phrase.lower().split()) for phrase in _PHRASE_RE.findall(query)]
+    return [phrase for phrase in phrases if phrase]
+
+def contains_phrases(text: str, phrases: list) -> bool:
+    """Case-insensitive phrase match, like $text does on plain fields"""
+    normalized = " ".join(text.lower().split())
+    return all(phrase in normalized for phrase in phrases)
+
+def make_snippet(text: str, terms: list, radius: int = SNIPPET_RADIUS) -> str:
+    """Return a short window of text around the first matching term"""
+    if not text:
+        return ""
+    lowered = text.lower()
+    positions = [lowered.find(term) for term in terms]
+    positions = [pos for pos in positions if pos >= 0]
+    start_at = min(positions) if positions else 0
+
+    start = max(start_at - radius, 0)
+    end = min(start_at + radius, len(text))
+    snippet = " ".join(text[start:end].split())
+    if start > 0:
+        snippet = "..." + snippet
+    if end < len(text):
+        snippet = snippet + "..."
+    return snippet
+
+async def search_user_history(user_id: str, query: str, page: int = 1, page_size: int = 20) -> dict:
+    """
+    Full-text search over a user's messages and chat titles.
+    Both collections are queried through their user-scoped text indexes and the
+    hits are merged by text score, so the cost depends on the number of matches
+    for this user rather than on the size of the collections. Quoted phrases
+    are checked against the decoded content, so compressed messages match too.
+    """
+    user_obj_id = ObjectId(user_id)
+    page = min(max(page, 1), MAX_PAGE)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+    skip = (page - 1) * page_size
+    # Fetch one extra hit so we can tell whether another page exists
+    limit = skip + page_size + 1
+
+    text_filter = {"user_id": user_obj_id, "$text": {"$search": query}}
+    score = {"$meta": "textScore"}
+
+    phrases = query_phrases(query)
+    message_filter = text_filter
+    message_limit = limit
+    if phrases:
+        message_filter = {"user_id": user_obj_id, "$text": {"$search": query.replace('"', " ")}}
+        message_limit = max(min(limit * PHRASE_CANDIDATE_FACTOR, MAX_PHRASE_CANDIDATES), limit)
+
+    message_docs = await db.messages.find(
+        message_filter,
+        {"score": score, "chat_id": 1, "role": 1, "content": 1, "content_encoding": 1, "timestamp": 1},
+    ).sort([("score", score)]).limit(message_limit).to_list(length=message_limit)
+    # Phrase matches past the candidate window may exist when it came back full
+    more_candidates = bool(phrases) and len(message_docs) == message_limit
+
+    chat_docs = await db.chats.find(
+        text_filter,
+        {"score": score, "title": 1, "updated_at": 1},
+    ).sort([("score", score)]).limit(limit).to_list(length=limit)
+
+    terms = query_terms(query)
+    hits = []
+    for msg in message_docs:
+        content = message_content(msg) or ""
+        if phrases and not contains_phrases(content, phrases):
+            continue
+        hits.append({
+            "type": "message",
+            "chat_id": str(msg["chat_id"]),
+            "message_id": str(msg["_id"]),
+            "role": msg.get("role"),
+            "snippet": make_snippet(content, terms),
+            "timestamp": msg.get("timestamp"),
+            "score": msg["score"],
+        })
+    for chat in chat_docs:
+        hits.append({
+            "type": "chat",
+            "chat_id": str(chat["_id"]),
+            "title": chat.get("title", "Untitled Chat"),
+            "snippet": chat.get("title", ""),
+            "timestamp": chat.get("updated_at"),
+            "score": chat["score"],
+        })
+
+    hits.sort(key=lambda hit: hit["score"], reverse=True)
+    results = hits[skip:skip + page_size]
+    return {
+        "query": query,
+        "page": page,
+        "page_size": page_size,
+        "has_more": page < MAX_PAGE and (len(hits) > skip + page_size or more_candidates),
+        "results": results,
+    }
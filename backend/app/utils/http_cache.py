@@ -0,0 +1,61 @@
+import hashlib
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request
+
+def make_etag(*parts) -> str:
+    """Build a weak ETag from the values that identify a resource version"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()
+    return f'W/"{digest[:32]}"'
+
+def _as_utc(dt: datetime) -> datetime:
+    # Mongo returns naive datetimes that are already in UTC
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+def http_date(dt: datetime) -> str:
+    return format_datetime(_as_utc(dt), usegmt=True)
+
+def _validator_time(last_modified: datetime) -> datetime:
+    """
+    Last-Modified as sent on the wire: the next whole second after the write.
+    HTTP dates have second precision, so anything written later in the same
+    second as last_modified must still compare as newer than the validator.
+    """
+    return _as_utc(last_modified).replace(microsecond=0) + timedelta(seconds=1)
+
+def cache_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    """Headers to send with a cacheable response (and with its 304)"""
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        validator = _validator_time(last_modified)
+        # While that second is still running another write could land in it
+        # unnoticed, so the ETag is the only validator until it has passed
+        if validator <= datetime.now(timezone.utc):
+            headers["Last-Modified"] = http_date(validator)
+    return headers
+
+def is_not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Evaluate If-None-Match / If-Modified-Since against the current version.
+    If-None-Match takes precedence, as required by RFC 9110.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        # Weak comparison: W/"x" and "x" refer to the same version
+        current = etag.removeprefix("W/")
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return current in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _validator_time(last_modified) <= _as_utc(since)
+    return False
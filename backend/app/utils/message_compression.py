@@ -0,0 +1,91 @@
+import re
+import zlib
+from bson import Binary
+from app.config import settings
+
+# Stored message documents carry an optional "content_encoding" flag:
+#   missing / None -> content is a plain string (documents written before compression)
+#   "zstd" / "zlib" -> content is Binary holding the compressed UTF-8 text
+# Compressed documents also get a plain "search_text" field (the distinct words of
+# the content) so the text index can still find them.
+ENCODINGS = ("zstd", "zlib")
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+_zstd = None
+
+def _load_zstd():
+    """Import zstandard on first use, None if it is not installed"""
+    global _zstd
+    if _zstd is None:
+        try:
+            import zstandard
+        except ImportError:
+            zstandard = False
+        _zstd = zstandard
+    return _zstd or None
+
+def preferred_encoding() -> str:
+    if settings.MESSAGE_COMPRESSION == "zstd" and _load_zstd() is not None:
+        return "zstd"
+    return "zlib"
+
+def compress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        return _load_zstd().ZstdCompressor(level=3).compress(data)
+    if encoding == "zlib":
+        return zlib.compress(data, 6)
+    raise ValueError(f"Unknown content encoding: {encoding}")
+
+def decompress_bytes(data: bytes, encoding: str) -> bytes:
+    if encoding == "zstd":
+        zstandard = _load_zstd()
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed messages")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if encoding == "zlib":
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown content encoding: {encoding}")
+
+def search_terms(text: str) -> str:
+    """Distinct lowercase words of text in first-seen order, for the text index"""
+    return " ".join(dict.fromkeys(word.lower() for word in _WORD_RE.findall(text)))
+
+def compress_message_doc(doc: dict, threshold: int = None, encoding: str = None) -> dict:
+    """
+    Compress doc["content"] in place when it is at least threshold bytes long.
+    A search_text field keeps the message findable through the text index.
+    Content that does not shrink (counting search_text) is left as plain text.
+    A threshold of 0 disables compression.
+    """
+    threshold = settings.MESSAGE_COMPRESSION_THRESHOLD if threshold is None else threshold
+    content = doc.get("content")
+    if threshold <= 0 or doc.get("content_encoding") or not isinstance(content, str):
+        return doc
+    data = content.encode("utf-8")
+    if len(data) < threshold:
+        return doc
+    encoding = encoding or preferred_encoding()
+    compressed = compress_bytes(data, encoding)
+    search_text = search_terms(content)
+    if len(compressed) + len(search_text.encode("utf-8")) < len(data):
+        doc["content"] = Binary(compressed)
+        doc["content_encoding"] = encoding
+        doc["search_text"] = search_text
+    return doc
+
+def message_content(doc: dict):
+    """Return the plain-text content of a stored message, compressed or not"""
+    encoding = doc.get("content_encoding")
+    content = doc.get("content")
+    if not encoding or content is None:
+        return content
+    return decompress_bytes(bytes(content), encoding).decode("utf-8")
+
+def decode_message_doc(doc: dict) -> dict:
+    """Replace compressed content with plain text and drop the storage-only fields"""
+    if doc.get("content_encoding"):
+        doc["content"] = message_content(doc)
+    doc.pop("content_encoding", None)
+    doc.pop("search_text", None)
+    return doc
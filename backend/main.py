@@ -1,13 +1,35 @@
+import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 import os
-from app.routes import auth, chat, history, image
+from app.routes import auth, chat, history, image, search, health
 from app.config import settings
+from app import db
+from app.services import ai_service
+from app.utils.http_compression import CompressionMiddleware
 
+logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are created here instead of at import time to keep cold starts cheap
+    db.connect()
+    await ai_service.init_clients()
+    try:
+        await db.ensure_indexes()
+        # Open the pool's minimum connections before the first request arrives
+        await db.warmup()
+    except Exception as e:
+        # Keep booting, /ready retries the indexes and reports the worker as
+        # unready until Mongo answers
+        logger.error(f"Mongo startup failed: {e}")
+    yield
+    await ai_service.close_clients()
+    db.close()
 
-app = FastAPI(debug=True)
+app = FastAPI(debug=True, lifespan=lifespan)
 FRONTEND_URL = settings.FRONTEND_URL
 # Add CORS middleware
 app.add_middleware(
@@ -16,7 +38,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Last-Modified"],
 )
+# Compress large JSON responses (history, search) with brotli or gzip
+app.add_middleware(CompressionMiddleware, minimum_size=1024)
 
 # Create uploads directory if it doesn't exist
 UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
@@ -30,6 +55,8 @@ app.include_router(auth.router)
 app.include_router(chat.router)
 app.include_router(history.router)
 app.include_router(image.router)
+app.include_router(search.router)
+app.include_router(health.router)
 
 @app.get("/")
 def read_root():
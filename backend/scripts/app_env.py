@@ -0,0 +1,19 @@
+"""Shared setup for the scripts that import the app outside of a deployment."""
+import os
+
+# Settings without a default in app/config.py; Settings() fails at import without them
+REQUIRED_SETTINGS = (
+    "MONGO_URI", "JWT_SECRET_KEY", "GEMINI_API_KEY", "OCR_SPACE_API_KEY",
+    "FRONTEND_URL", "FROM_EMAIL", "RESEND_API_KEY",
+)
+
+def set_placeholder_settings(environ=None, **defaults):
+    """
+    Fill missing required settings in environ (os.environ by default) so the
+    app modules can be imported. Values already set are kept; keyword
+    arguments give non-empty defaults for specific settings.
+    """
+    environ = os.environ if environ is None else environ
+    for key in REQUIRED_SETTINGS:
+        environ.setdefault(key, defaults.get(key, ""))
+    return environ
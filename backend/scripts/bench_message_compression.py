@@ -0,0 +1,118 @@
+"""
+Storage and read-latency report for compressed message contents.
+
+Builds a synthetic corpus shaped like MediScan traffic (short user questions,
+long markdown prescription analyses and answers), stores it the way
+chat_with_ai does and reports the size savings and the decode cost per
+message and per session read. Runs offline, no database needed.
+
+Usage (from the backend directory):
+    python -m scripts.bench_message_compression --messages 5000
+"""
+import argparse
+import random
+import statistics
+import time
+from scripts.app_env import set_placeholder_settings
+
+DRUGS = [
+    "Amoxicillin", "Metformin", "Atorvastatin", "Lisinopril", "Amlodipine",
+    "Omeprazole", "Levothyroxine", "Warfarin", "Clopidogrel", "Ibuprofen",
+    "Paracetamol", "Prednisolone", "Salbutamol", "Sertraline", "Gabapentin",
+]
+POINTS = [
+    "Take with food to reduce gastrointestinal upset.",
+    "Avoid alcohol while on this medication.",
+    "Monitor renal function periodically, especially in elderly patients.",
+    "May cause dizziness; avoid driving until you know how it affects you.",
+    "Store at room temperature away from moisture and heat.",
+    "Report any unusual bleeding or bruising to your doctor immediately.",
+    "Complete the full course even if symptoms improve.",
+    "Check blood glucose regularly and watch for signs of hypoglycemia.",
+]
+
+def make_analysis(rng: random.Random) -> str:
+    drugs = rng.sample(DRUGS, rng.randint(2, 5))
+    lines = ["## Medications Identified", ""]
+    for drug in drugs:
+        lines.append(f"- **{drug}** {rng.choice([5, 10, 20, 250, 500])} mg, "
+                     f"{rng.choice(['once daily', 'twice daily', 'every 8 hours'])}")
+    lines += ["", "## Potential Issues", ""]
+    for a, b in zip(drugs, drugs[1:]):
+        lines.append(f"- **{a} + {b}**: moderate interaction. {rng.choice(POINTS)}")
+    lines += ["", "## Patient Counseling Points", ""]
+    for drug in drugs:
+        lines.append(f"### {drug}")
+        lines.append(f"{drug} is indicated here at a {rng.choice(['standard', 'reduced', 'high'])} dose. "
+                     f"Verify the dose against the patient's age and weight before dispensing, "
+                     f"and review the interaction notes above with the prescriber if needed.")
+        lines += [f"- {point}" for point in rng.sample(POINTS, rng.randint(4, 6))]
+        lines.append("")
+    lines += ["## Unclear Parts", "", "- Patient weight could not be read from the OCR text."]
+    return "\n".join(lines)
+
+def make_question(rng: random.Random) -> str:
+    return f"Can I take {rng.choice(DRUGS).lower()} with {rng.choice(DRUGS).lower()}?"
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark message content compression")
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--session-size", type=int, default=40)
+    parser.add_argument("--threshold", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    set_placeholder_settings()
+    from app.config import settings
+    from app.utils.message_compression import compress_message_doc, decode_message_doc, preferred_encoding
+
+    threshold = args.threshold if args.threshold is not None else settings.MESSAGE_COMPRESSION_THRESHOLD
+    rng = random.Random(args.seed)
+    corpus = []
+    for i in range(args.messages):
+        role = "user" if i % 2 == 0 else "ai"
+        corpus.append({"role": role, "content": make_question(rng) if role == "user" else make_analysis(rng)})
+
+    encodings = sorted({preferred_encoding(), "zlib"})
+    print(f"{args.messages} messages, threshold {threshold} bytes")
+    for encoding in encodings:
+        raw_bytes = stored_bytes = compressed = 0
+        stored = []
+        for doc in corpus:
+            raw_bytes += len(doc["content"].encode("utf-8"))
+            stored_doc = compress_message_doc(dict(doc), threshold=threshold, encoding=encoding)
+            if stored_doc.get("content_encoding"):
+                # The plain search_text copy is part of the stored size
+                stored_bytes += len(stored_doc["content"]) + len(stored_doc["search_text"].encode("utf-8"))
+            else:
+                stored_bytes += len(stored_doc["content"].encode("utf-8"))
+            compressed += bool(stored_doc.get("content_encoding"))
+            stored.append(stored_doc)
+
+        decode_us = []
+        for doc in stored:
+            if not doc.get("content_encoding"):
+                continue
+            t0 = time.perf_counter()
+            decode_message_doc(dict(doc))
+            decode_us.append((time.perf_counter() - t0) * 1e6)
+
+        session_ms = []
+        for i in range(0, len(stored) - args.session_size + 1, args.session_size):
+            t0 = time.perf_counter()
+            for doc in stored[i:i + args.session_size]:
+                decode_message_doc(dict(doc))
+            session_ms.append((time.perf_counter() - t0) * 1000)
+
+        decode_us.sort()
+        p95 = decode_us[int(len(decode_us) * 0.95)] if decode_us else 0.0
+        print(f"[{encoding}] compressed {compressed}/{len(corpus)} messages: "
+              f"{raw_bytes / 1024:.0f}KB -> {stored_bytes / 1024:.0f}KB "
+              f"({100 * (1 - stored_bytes / raw_bytes):.1f}% saved)")
+        if decode_us:
+            print(f"[{encoding}] decode per message p50={statistics.median(decode_us):.1f}us "
+                  f"p95={p95:.1f}us, per {args.session_size}-message session "
+                  f"p50={statistics.median(session_ms):.3f}ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark for the chat history search endpoint.
+
+Seeds a throwaway MongoDB database with a synthetic consultation history
+(one large user plus a number of background users), builds the indexes and
+times search_user_history for a set of typical queries. Every few AI answers
+is a long analysis that is stored compressed, as chat_with_ai stores it, so
+term and phrase queries also run against compressed messages.
+
+Usage (from the backend directory):
+    python -m scripts.bench_search --mongo-uri mongodb://localhost:27017/mediscan_bench
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from scripts.app_env import set_placeholder_settings
+
+DRUGS = [
+    "amoxicillin", "metformin", "atorvastatin", "lisinopril", "amlodipine",
+    "omeprazole", "levothyroxine", "warfarin", "clopidogrel", "ibuprofen",
+    "paracetamol", "prednisolone", "salbutamol", "sertraline", "gabapentin",
+    "azithromycin", "ciprofloxacin", "losartan", "furosemide", "insulin",
+]
+FILLER = (
+    "dose tablet daily twice patient interaction renal hepatic monitor "
+    "counseling food alcohol adverse effect contraindicated elderly pediatric "
+    "weight allergy history pressure glucose levels review prescription"
+).split()
+QUERIES = ["warfarin", "metformin renal", "amoxicillin allergy", "\"twice daily\"", "insulin glucose"]
+
+def make_text(rng: random.Random, words: int) -> str:
+    parts = [rng.choice(FILLER) for _ in range(words)]
+    for _ in range(rng.randint(1, 3)):
+        parts.insert(rng.randrange(len(parts)), rng.choice(DRUGS))
+    return " ".join(parts).capitalize() + "."
+
+def make_user_docs(rng: random.Random, user_id, messages: int, per_chat: int, long_every: int):
+    from bson import ObjectId
+    from app.utils.message_compression import compress_message_doc
+
+    start = datetime.utcnow() - timedelta(days=365)
+    chats, msgs = [], []
+    for i in range(0, messages, per_chat):
+        chat_id = ObjectId()
+        created = start + timedelta(minutes=i)
+        chats.append({
+            "_id": chat_id,
+            "user_id": user_id,
+            "title": make_text(rng, 4),
+            "created_at": created,
+            "updated_at": created,
+        })
+        for j in range(min(per_chat, messages - i)):
+            if j % 2 == 0:
+                words = 12
+            elif long_every and (i + j) % (2 * long_every) == 1:
+                words = 600
+            else:
+                words = 60
+            msgs.append(compress_message_doc({
+                "chat_id": chat_id,
+                "user_id": user_id,
+                "role": "user" if j % 2 == 0 else "ai",
+                "content": make_text(rng, words),
+                "timestamp": created + timedelta(seconds=j),
+            }))
+    return chats, msgs
+
+async def seed(db, args):
+    from bson import ObjectId
+
+    rng = random.Random(args.seed)
+    target_user = ObjectId()
+    users = [(target_user, args.messages)]
+    users += [(ObjectId(), args.other_messages) for _ in range(args.other_users)]
+    compressed = 0
+    for user_id, count in users:
+        chats, msgs = make_user_docs(rng, user_id, count, args.per_chat, args.long_every)
+        compressed += sum(1 for msg in msgs if msg.get("content_encoding"))
+        if chats:
+            await db.chats.insert_many(chats, ordered=False)
+        for i in range(0, len(msgs), 10000):
+            await db.messages.insert_many(msgs[i:i + 10000], ordered=False)
+    print(f"{compressed} messages stored compressed")
+    return target_user
+
+async def run(args):
+    os.environ["MONGO_URI"] = args.mongo_uri
+    set_placeholder_settings()
+
+    from app.db import db, connect, close, ensure_indexes
+    from app.services.search_service import search_user_history
+
+    connect()
+    await db.chats.drop()
+    await db.messages.drop()
+    print(f"Seeding {args.messages} messages for the target user "
+          f"and {args.other_users}x{args.other_messages} for background users...")
+    started = time.perf_counter()
+    user_id = await seed(db, args)
+    await ensure_indexes()
+    print(f"Seeded and indexed in {time.perf_counter() - started:.1f}s")
+
+    for query in QUERIES:
+        timings = []
+        for page in range(1, args.repeat + 1):
+            t0 = time.perf_counter()
+            result = await search_user_history(str(user_id), query, page=(page - 1) % 5 + 1)
+            timings.append((time.perf_counter() - t0) * 1000)
+        timings.sort()
+        p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+        print(f"{query!r:24} hits/page={len(result['results']):3d} "
+              f"p50={statistics.median(timings):7.1f}ms p95={p95:7.1f}ms")
+
+    if not args.keep:
+        await db.client.drop_database(db.name)
+    close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark chat history search")
+    parser.add_argument("--mongo-uri", default="mongodb://localhost:27017/mediscan_bench")
+    parser.add_argument("--messages", type=int, default=300_000)
+    parser.add_argument("--per-chat", type=int, default=20)
+    parser.add_argument("--long-every", type=int, default=5,
+                        help="every Nth AI answer is a long, compressed analysis (0: none)")
+    parser.add_argument("--other-users", type=int, default=20)
+    parser.add_argument("--other-messages", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--keep", action="store_true", help="keep the seeded database")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
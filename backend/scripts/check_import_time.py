@@ -0,0 +1,83 @@
+"""
+Import-time profile check for the backend.
+
+Imports the app in a fresh interpreter with `python -X importtime`, fails if any
+of the heavy SDKs that should only load on first use were imported, and fails
+if the cumulative import time of the app goes over the budget.
+
+Usage (from the backend directory):
+    python -m scripts.check_import_time --budget-ms 1500
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from scripts.app_env import set_placeholder_settings
+
+# Modules that must not be imported just by importing the app
+LAZY_MODULES = [
+    "google.generativeai",
+    "requests",
+    "pytesseract",
+    "PIL",
+    "motor",
+    "pymongo",
+]
+
+_IMPORTTIME_RE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def profile_import(module: str) -> tuple:
+    """Import module in a subprocess and return (cumulative_us, loaded_modules, rows)"""
+    env = set_placeholder_settings(dict(os.environ), MONGO_URI="mongodb://localhost:27017/mediscan")
+
+    code = f"import sys, {module}; print('\\n'.join(sorted(sys.modules)))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, env=env,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    rows = []
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        rows.append((int(cumulative_us), int(self_us), name))
+        # Top-level imports have no extra indentation
+        if len(indent) == 1:
+            cumulative += int(cumulative_us)
+    return cumulative, set(result.stdout.split()), rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Guard the app's cold-start import time")
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0)
+    parser.add_argument("--top", type=int, default=15, help="slowest imports to print")
+    args = parser.parse_args()
+
+    cumulative_us, loaded, rows = profile_import(args.module)
+    total_ms = cumulative_us / 1000
+
+    print(f"Importing {args.module} took {total_ms:.1f}ms (budget {args.budget_ms:.0f}ms)")
+    print("Slowest imports (cumulative):")
+    for cumulative, _, name in sorted(rows, reverse=True)[:args.top]:
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+
+    failures = []
+    eager = [name for name in LAZY_MODULES if name in loaded]
+    if eager:
+        failures.append(f"modules that should load lazily were imported: {', '.join(eager)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.1f}ms is over the {args.budget_ms:.0f}ms budget")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Offline check of the model router: routing, hedging, error fallthrough and
+deadlines, using FakeModel backends plugged in through ai_service.set_router.
+No network or API keys needed.
+
+Usage (from the backend directory):
+    python -m scripts.check_model_router
+"""
+import asyncio
+import sys
+import threading
+import time
+from types import SimpleNamespace
+from scripts.app_env import set_placeholder_settings
+
+async def check_routing(ModelRouter, FakeModel):
+    light, full = FakeModel("light", "light"), FakeModel("full", "full")
+    router = ModelRouter(light, full, short_query_chars=20)
+    assert await router.generate("prompt", query="short question") == "light"
+    assert await router.generate("prompt", query="x" * 21) == "full"
+    assert await router.generate("prompt", task="prescription", query="short") == "full"
+
+async def check_hedging(ModelRouter, FakeModel):
+    # 20 fast calls set the latency percentile, then one call stalls for 2s
+    full = FakeModel("full", "answer", latency=[0.01] * 20 + [2.0, 0.01])
+    router = ModelRouter(FakeModel("light"), full, deadline=5, min_hedge_delay=0.05, min_samples=20)
+    for _ in range(20):
+        await router.generate("prompt", task="prescription")
+    started = time.monotonic()
+    assert await router.generate("prompt", task="prescription") == "answer"
+    assert time.monotonic() - started < 1.0, "hedged request did not win"
+    assert router.hedges_sent == 1 and full.calls == 22
+
+async def check_error_fallthrough(ModelRouter, FakeModel):
+    # The stalled primary (call 21) fails after the hedge (call 22) was sent,
+    # the hedge's answer must still be returned
+    calls = []
+
+    def respond(prompt):
+        calls.append(prompt)
+        if len(calls) == 21:
+            raise ValueError("primary failed")
+        return "answer"
+
+    full = FakeModel("full", respond, latency=[0.01] * 20 + [0.2, 0.3])
+    router = ModelRouter(FakeModel("light"), full, deadline=5, min_hedge_delay=0.05, min_samples=20)
+    for _ in range(20):
+        await router.generate("prompt", task="prescription")
+    assert await router.generate("prompt", task="prescription") == "answer"
+    assert router.hedges_sent == 1
+
+    # When every attempt fails the error propagates
+    broken = ModelRouter(FakeModel("light"), FakeModel("full", error=ValueError("upstream failed")))
+    try:
+        await broken.generate("prompt", task="prescription")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("errors from every attempt must propagate")
+
+async def check_deadline(ModelRouter, FakeModel):
+    slow = FakeModel("full", latency=5)
+    router = ModelRouter(FakeModel("light"), slow, deadline=0.1)
+    started = time.monotonic()
+    try:
+        await router.generate("prompt", task="prescription")
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("deadline did not fire")
+    assert time.monotonic() - started < 1.0
+
+async def check_cutoff_latency(ModelRouter, FakeModel):
+    # A primary cut off by the deadline still counts, from when the request started
+    router = ModelRouter(FakeModel("light"), FakeModel("full", latency=5), deadline=0.2, min_samples=1)
+    try:
+        await router.generate("prompt", task="prescription")
+    except TimeoutError:
+        pass
+    await asyncio.sleep(0)
+    samples = list(router.latencies["full"].samples)
+    assert len(samples) == 1 and samples[0] >= 0.19, f"cut-off primary not recorded: {samples}"
+
+    # A primary cancelled because the hedge won is recorded too, the winning hedge as well
+    full = FakeModel("full", latency=[0.01] * 20 + [2.0, 0.01])
+    router = ModelRouter(FakeModel("light"), full, deadline=5, min_hedge_delay=0.05, min_samples=20)
+    for _ in range(21):
+        await router.generate("prompt", task="prescription")
+    await asyncio.sleep(0)
+    assert len(router.latencies["full"].samples) == 22
+    assert max(router.latencies["full"].samples) >= 0.05
+
+async def check_blocking_backend(ModelRouter, FakeModel):
+    # A backend that blocks a worker thread (a sync SDK call) is not stopped by
+    # cancelling its task, only by honouring the timeout the router passes it
+    finished = threading.Event()
+
+    class ThreadedModel:
+        name = "full"
+
+        def _call(self, timeout):
+            try:
+                time.sleep(min(5.0, timeout))
+            finally:
+                finished.set()
+            raise TimeoutError("upstream timed out")
+
+        async def generate(self, prompt, timeout=None):
+            import anyio
+
+            return await anyio.to_thread.run_sync(self._call, timeout)
+
+    router = ModelRouter(FakeModel("light"), ThreadedModel(), deadline=0.2)
+    started = time.monotonic()
+    try:
+        await router.generate("prompt", task="prescription")
+    except TimeoutError:
+        pass
+    else:
+        raise AssertionError("deadline did not fire")
+    # The thread must be released around the deadline, not after the full 5s call
+    assert await asyncio.to_thread(finished.wait, 1.0), "worker thread outlived the deadline"
+    assert time.monotonic() - started < 1.0
+
+async def check_gemini_timeout(ModelRouter, FakeModel):
+    # GeminiModel with a stand-in SDK: the remaining deadline is passed as the
+    # SDK timeout and a stalled call is cancelled instead of left running
+    from app.services import model_router
+
+    seen = {}
+
+    class StalledModel:
+        def __init__(self, name):
+            self.name = name
+
+        async def generate_content_async(self, prompt, request_options=None):
+            seen["request_options"] = request_options
+            try:
+                await asyncio.sleep(5)
+            except asyncio.CancelledError:
+                seen["cancelled"] = True
+                raise
+
+    saved = model_router._genai
+    model_router._genai = SimpleNamespace(GenerativeModel=StalledModel)
+    try:
+        router = ModelRouter(FakeModel("light"), model_router.GeminiModel("full"), deadline=0.2)
+        try:
+            await router.generate("prompt", task="prescription")
+        except TimeoutError:
+            pass
+        else:
+            raise AssertionError("deadline did not fire")
+    finally:
+        model_router._genai = saved
+    await asyncio.sleep(0)
+    timeout = (seen.get("request_options") or {}).get("timeout")
+    assert timeout is not None and 0 < timeout <= 0.2, f"SDK timeout not passed: {seen}"
+    assert seen.get("cancelled"), "stalled SDK call was not cancelled"
+
+async def check_ai_service(ModelRouter, FakeModel):
+    from app.services import ai_service
+
+    ai_service.set_router(ModelRouter(FakeModel("light", "light answer"), FakeModel("full", "full answer")))
+    assert await ai_service.generate_ai_response("Dose of paracetamol?") == "light answer"
+    ai_service.set_router(ModelRouter(FakeModel("light", latency=5), FakeModel("full"), deadline=0.1))
+    assert "took too long" in await ai_service.generate_ai_response("Dose of paracetamol?")
+    ai_service.set_router(None)
+
+async def run() -> int:
+    from app.services.model_router import ModelRouter, FakeModel
+
+    failures = 0
+    checks = (check_routing, check_hedging, check_error_fallthrough, check_deadline,
+              check_cutoff_latency, check_blocking_backend, check_gemini_timeout, check_ai_service)
+    for check in checks:
+        try:
+            await check(ModelRouter, FakeModel)
+            print(f"ok    {check.__name__}")
+        except Exception as e:
+            failures += 1
+            print(f"FAIL  {check.__name__}: {e!r}")
+    return failures
+
+def main():
+    set_placeholder_settings()
+    sys.exit(1 if asyncio.run(run()) else 0)
+
+if __name__ == "__main__":
+    main()
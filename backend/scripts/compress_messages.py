@@ -0,0 +1,85 @@
+"""
+Compress the content of existing messages that were stored as plain text.
+
+Only documents without a content_encoding flag whose content is at least the
+threshold size are rewritten. Each gets a plain search_text field so it stays
+searchable (run the app once, or call ensure_indexes, to build the index).
+Documents are rewritten at most once, so the tool can be re-run safely and can run
+while the app is serving traffic.
+
+Usage (from the backend directory, with the app's .env in place):
+    python -m scripts.compress_messages --dry-run
+    python -m scripts.compress_messages --batch-size 1000
+"""
+import argparse
+import asyncio
+import time
+
+async def run(args):
+    from pymongo import UpdateOne
+    from app.config import settings
+    from app.db import db, connect, close
+    from app.utils.message_compression import compress_message_doc, preferred_encoding
+
+    threshold = args.threshold if args.threshold is not None else settings.MESSAGE_COMPRESSION_THRESHOLD
+    if threshold <= 0:
+        print("Compression is disabled (threshold <= 0), nothing to do")
+        return
+    encoding = args.encoding or preferred_encoding()
+    connect()
+
+    query = {
+        "content_encoding": {"$exists": False},
+        "content": {"$type": "string"},
+        "$expr": {"$gte": [{"$strLenBytes": "$content"}, threshold]},
+    }
+    cursor = db.messages.find(query, {"content": 1}).sort("_id", 1).batch_size(args.batch_size)
+
+    scanned = compressed = bytes_before = bytes_after = 0
+    started = time.perf_counter()
+    ops = []
+    async for doc in cursor:
+        scanned += 1
+        original = doc["content"]
+        compress_message_doc(doc, threshold=threshold, encoding=encoding)
+        if not doc.get("content_encoding"):
+            continue
+        compressed += 1
+        bytes_before += len(original.encode("utf-8"))
+        bytes_after += len(doc["content"]) + len(doc["search_text"].encode("utf-8"))
+        # Guard on the original content so concurrent edits are never overwritten
+        ops.append(UpdateOne(
+            {"_id": doc["_id"], "content": original},
+            {"$set": {
+                "content": doc["content"],
+                "content_encoding": doc["content_encoding"],
+                "search_text": doc["search_text"],
+            }},
+        ))
+        if len(ops) >= args.batch_size:
+            if not args.dry_run:
+                await db.messages.bulk_write(ops, ordered=False)
+            ops = []
+    if ops and not args.dry_run:
+        await db.messages.bulk_write(ops, ordered=False)
+    close()
+
+    saved = bytes_before - bytes_after
+    ratio = bytes_after / bytes_before if bytes_before else 1.0
+    action = "Would compress" if args.dry_run else "Compressed"
+    print(f"Scanned {scanned} messages >= {threshold} bytes in {time.perf_counter() - started:.1f}s")
+    print(f"{action} {compressed} messages with {encoding}: "
+          f"{bytes_before / 1024:.1f}KB -> {bytes_after / 1024:.1f}KB "
+          f"(saved {saved / 1024:.1f}KB, ratio {ratio:.2f})")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compress existing plain-text message contents")
+    parser.add_argument("--threshold", type=int, default=None,
+                        help="minimum content size in bytes (default: MESSAGE_COMPRESSION_THRESHOLD)")
+    parser.add_argument("--encoding", choices=["zstd", "zlib"], default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="report savings without writing")
+    asyncio.run(run(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()